@@ -1,15 +1,101 @@
 import asyncio
+import diskcache
+import httpx
 from crawl4ai import AsyncWebCrawler
-from typing import List, Dict
+from markdownify import markdownify
+from readability import Document
+from typing import List, Dict, Optional
+
+# Pages whose extracted article is shorter than this are assumed to be
+# JS-rendered and are retried with the full browser crawler.
+_MIN_READABLE_LENGTH = 500
+
+# Fetched markdown is kept on disk for a week so repeat sessions (and
+# re-runs of the same query during development) skip the network entirely.
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
 
 class ContentFetcher:
     """
-    A utility class to fetch content from a list of URLs using Crawl4AI's AsyncWebCrawler.
+    A utility class to fetch content from a list of URLs.
+
+    Most SERP results serve static HTML, so each URL is first fetched with a
+    plain httpx GET and run through readability; only pages that come back
+    empty or too short fall back to Crawl4AI's headless-browser crawler. The
+    HTTP client and crawler are long-lived and shared across the session:
+    call `start()` once before fetching (or let `fetch_content` lazily start
+    them) and `close()` when the session is done.
     """
 
+    def __init__(self, concurrency_limit: int = 10, cache_dir: Optional[str] = "./.fetch_cache"):
+        """
+        Initialize the ContentFetcher.
+
+        Parameters:
+            concurrency_limit (int): Maximum number of URLs fetched concurrently.
+            cache_dir (str, optional): Directory for the persistent URL->markdown
+                cache. Pass None to disable caching.
+        """
+        self.semaphore = asyncio.Semaphore(concurrency_limit)
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.cache: Optional[diskcache.Cache] = diskcache.Cache(cache_dir) if cache_dir else None
+
+    async def start(self):
+        """
+        Start the shared HTTP client if it is not already running. The
+        browser crawler is started lazily, only when a page needs it.
+        """
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=50),
+            )
+
+    async def close(self):
+        """
+        Shut down the HTTP client and the crawler, if running.
+        """
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        if self.crawler is not None:
+            await self.crawler.__aexit__(None, None, None)
+            self.crawler = None
+
+    async def _ensure_crawler(self) -> AsyncWebCrawler:
+        if self.crawler is None:
+            self.crawler = AsyncWebCrawler()
+            await self.crawler.__aenter__()
+        return self.crawler
+
+    async def _fetch_fast(self, url: str) -> Optional[str]:
+        """
+        Fast path: plain GET + readability extraction, no browser. Returns
+        markdown, or None if the page doesn't yield enough readable content.
+        """
+        try:
+            response = await self.http_client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type:
+            return None
+
+        summary_html = Document(response.text).summary()
+        if len(summary_html) < _MIN_READABLE_LENGTH:
+            return None
+
+        return markdownify(summary_html)
+
     async def fetch_content(self, urls: List[str]) -> List[Dict[str, str]]:
         """
         Asynchronously fetch webpage content from a list of URLs.
+        All URLs are dispatched concurrently (bounded by the semaphore), so total
+        latency is roughly that of the slowest URL instead of the sum of all fetches.
 
         Parameters:
             urls (List[str]): List of webpage URLs.
@@ -18,14 +104,31 @@ class ContentFetcher:
             List[Dict[str, str]]: A list of dictionaries with 'url' and 'content'.
         """
 
-        content_list = []
-        
-        async with AsyncWebCrawler() as crawler:
-            for url in urls:
-                try:
+        await self.start()
+
+        async def _fetch_one(url: str) -> Dict[str, str]:
+            if self.cache is not None and (cached := self.cache.get(url)) is not None:
+                return {"url": url, "content": cached}
+
+            async with self.semaphore:
+                markdown = await self._fetch_fast(url)
+                if markdown is None:
+                    crawler = await self._ensure_crawler()
                     result = await crawler.arun(url)
-                    content_list.append({"url": url, "content": result.markdown})
-                except Exception as e:
-                    print(f"Failed to fetch content for {url}: {e}")
-        
-        return content_list
\ No newline at end of file
+                    markdown = result.markdown
+                if self.cache is not None and markdown:
+                    self.cache.set(url, markdown, expire=_CACHE_TTL_SECONDS)
+                return {"url": url, "content": markdown}
+
+        results = await asyncio.gather(
+            *(_fetch_one(url) for url in urls), return_exceptions=True
+        )
+
+        content_list = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                print(f"Failed to fetch content for {url}: {result}")
+            else:
+                content_list.append(result)
+
+        return content_list
@@ -1,9 +1,34 @@
+import asyncio
+import hashlib
+import json
 import os
+import random
 import time
+from collections import OrderedDict
 from typing import List, Dict, Any
-from google import genai  
+
+import httpx
+from google import genai
+from google.genai import errors as genai_errors
 from dotenv import load_dotenv
 
+# Response cache tuning: prompts are only cached when the call is
+# determinism-leaning (low temperature), entries expire after an hour.
+_CACHE_MAX_ENTRIES = 256
+_CACHE_TTL_SECONDS = 3600
+_CACHE_TEMPERATURE_CUTOFF = 0.3
+
+def _is_retriable(exc: Exception) -> bool:
+    """
+    Only transient failures (rate limits, server errors, timeouts) are worth
+    retrying; anything else (bad request, auth) fails the same way every time.
+    """
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code == 429 or (exc.code is not None and exc.code >= 500)
+    return False
+
 class LLMClient:
     """
     A reusable client for interacting with the Gemini API.
@@ -22,51 +47,144 @@ class LLMClient:
             raise ValueError("Gemini API key is required.")
 
         self.client = genai.Client(api_key=self.api_key)
+        # LRU response cache keyed by a hash of the full request. The research
+        # loop reissues structurally identical prompts across iterations; a
+        # cache hit saves a whole LLM round-trip.
+        self._response_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
-    def generate(
+    def _cache_key(
         self,
         system_prompt: str,
         messages: List[Dict[str, str]],
-        max_tokens: int = 1024, 
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": self.model,
+                "system_prompt": system_prompt,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Dict[str, Any]:
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["ts"] > _CACHE_TTL_SECONDS:
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        return entry["result"]
+
+    def _cache_put(self, key: str, result: Dict[str, Any]):
+        self._response_cache[key] = {"result": result, "ts": time.time()}
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > _CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+    async def generate(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1024,
         temperature: float = 0.6,
-        retries: int = 3
+        retries: int = 5,
+        timeout: float = 120.0
     ) -> Dict[str, Any]:
         """
         Generate a structured response from the Gemini API.
+        Uses the async client so concurrent callers share the event loop instead
+        of blocking it for the whole LLM round-trip.
 
         Parameters:
             system_prompt (str): The system instructions for the LLM.
             messages (List[Dict[str, str]]): User and assistant messages in structured format.
             max_tokens (int): Maximum tokens for the response.
             temperature (float): Controls randomness.
-            retries (int): Number of retry attempts.
+            retries (int): Number of retry attempts for transient failures.
+            timeout (float): Per-request timeout in seconds.
 
         Returns:
             Dict[str, Any]: Structured output from the model.
         """
+        cache_key = None
+        if temperature <= _CACHE_TEMPERATURE_CUTOFF:
+            cache_key = self._cache_key(system_prompt, messages, max_tokens, temperature)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
         user_contents = "\n".join(m["content"] for m in messages if m["role"] == "user")
 
         config = {
             "max_output_tokens": max_tokens,
             "temperature": temperature,
-            "system_instruction": system_prompt
+            "system_instruction": system_prompt,
+            "http_options": {"timeout": int(timeout * 1000)}
         }
 
         for attempt in range(retries):
             try:
-                response = self.client.models.generate_content(
+                response = await self.client.aio.models.generate_content(
                     model=self.model,
                     contents=user_contents,
                     config=config
                 )
-                return {
+                result = {
                     "success": True,
-                    "response": response.text, 
-                    "usage": {}  
+                    "response": response.text,
+                    "usage": {}
                 }
+                if cache_key is not None:
+                    self._cache_put(cache_key, result)
+                return result
             except Exception as e:
-                print(f"LLM API request failed: {e}. Retrying ({attempt+1}/{retries})...")
-                time.sleep(2)
+                if not _is_retriable(e):
+                    print(f"LLM API request failed with non-retriable error: {e}")
+                    return {"success": False, "error": str(e)}
+                # Exponential backoff with jitter so concurrent retries don't
+                # hammer the API in lockstep after a 429/5xx.
+                wait = random.uniform(2, 4) * (attempt + 1)
+                print(f"LLM API request failed: {e}. Retrying in {wait:.1f}s ({attempt+1}/{retries})...")
+                await asyncio.sleep(wait)
 
         return {"success": False, "error": "LLM API request failed after retries"}
 
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1024,
+        temperature: float = 0.6,
+        timeout: float = 120.0
+    ):
+        """
+        Stream a response from the Gemini API, yielding text chunks as they
+        arrive instead of waiting for the full generation. Transport errors
+        propagate to the caller; there is no retry once streaming has begun.
+
+        Yields:
+            str: Incremental text chunks of the response.
+        """
+        user_contents = "\n".join(m["content"] for m in messages if m["role"] == "user")
+
+        config = {
+            "max_output_tokens": max_tokens,
+            "temperature": temperature,
+            "system_instruction": system_prompt,
+            "http_options": {"timeout": int(timeout * 1000)}
+        }
+
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=user_contents,
+            config=config
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
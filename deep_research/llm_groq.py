@@ -1,7 +1,20 @@
+import asyncio
 import os
-import time
+import random
 from typing import List, Dict, Any
-from groq import Groq
+import groq
+from groq import AsyncGroq
+
+def _is_retriable(exc: Exception) -> bool:
+    """
+    Only transient failures (rate limits, server errors, timeouts) are worth
+    retrying; anything else (bad request, auth) fails the same way every time.
+    """
+    if isinstance(exc, (groq.APITimeoutError, groq.APIConnectionError, groq.RateLimitError)):
+        return True
+    if isinstance(exc, groq.APIStatusError):
+        return exc.status_code >= 500
+    return False
 
 class LLMClient:
     """
@@ -18,25 +31,29 @@ class LLMClient:
         if not self.api_key:
             raise ValueError("Groq API key is required.")
 
-        self.client = Groq(api_key=self.api_key)
+        self.client = AsyncGroq(api_key=self.api_key)
 
-    def generate(
+    async def generate(
         self,
         system_prompt: str,
         messages: List[Dict[str, str]],
         max_tokens: int = 1024,
         temperature: float = 0.6,
-        retries: int = 3
+        retries: int = 5,
+        timeout: float = 120.0
     ) -> Dict[str, Any]:
         """
         Generate a structured response from the LLM.
+        Uses the async client so concurrent callers share the event loop instead
+        of blocking it for the whole LLM round-trip.
 
         Parameters:
             system_prompt (str): The system instructions for the LLM.
             messages (List[Dict[str, str]]): User and assistant messages in structured format.
             max_tokens (int): Maximum tokens for response.
             temperature (float): Controls randomness.
-            retries (int): Number of retry attempts.
+            retries (int): Number of retry attempts for transient failures.
+            timeout (float): Per-request timeout in seconds.
 
         Returns:
             Dict[str, Any]: Structured output from the model.
@@ -46,11 +63,12 @@ class LLMClient:
 
         for attempt in range(retries):
             try:
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=full_messages,
                     max_tokens=max_tokens,
                     temperature=temperature,
+                    timeout=timeout,
                     # reasoning_format="hidden"
                 )
 
@@ -61,16 +79,25 @@ class LLMClient:
                 }
 
             except Exception as e:
-                print(f"LLM API request failed: {e}. Retrying ({attempt+1}/{retries})...")
-                time.sleep(2)
+                if not _is_retriable(e):
+                    print(f"LLM API request failed with non-retriable error: {e}")
+                    return {"success": False, "error": str(e)}
+                # Exponential backoff with jitter so concurrent retries don't
+                # hammer the API in lockstep after a 429/5xx.
+                wait = random.uniform(2, 4) * (attempt + 1)
+                print(f"LLM API request failed: {e}. Retrying in {wait:.1f}s ({attempt+1}/{retries})...")
+                await asyncio.sleep(wait)
 
         return {"success": False, "error": "LLM API request failed after retries"}
 
 # Example Usage
 if __name__ == "__main__":
-    llm = LLMClient()
-    result = llm.generate(
-        system_prompt="You are an AI assistant that provides structured research outputs.",
-        messages=[{"role": "user", "content": "Explain quantum computing."}]
-    )
-    print(result)
+    async def _demo():
+        llm = LLMClient()
+        result = await llm.generate(
+            system_prompt="You are an AI assistant that provides structured research outputs.",
+            messages=[{"role": "user", "content": "Explain quantum computing."}]
+        )
+        print(result)
+
+    asyncio.run(_demo())
@@ -1,7 +1,7 @@
 import asyncio
-import json
 import logging
-import re
+
+import orjson
 from typing import List, Dict, Optional, Any
 from search import WebSearch
 from llm import LLMClient
@@ -12,14 +12,16 @@ import os
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-def system_prompt() -> str:
+def system_prompt(now: "date" = None) -> str:
     """
-    Returns the system prompt string.
+    Returns the system prompt string for the given date (today by default).
+    The date is truncated to the day so the prompt bytes stay identical across
+    calls within a run, keeping provider-side prefix caches warm.
     """
     from datetime import datetime
-    now = datetime.utcnow().isoformat()
+    today = (now or datetime.utcnow().date()).isoformat()
     return (
-        f"You are an expert researcher. Today is {now}. Follow these instructions when responding:\n"
+        f"You are an expert researcher. Today is {today}. Follow these instructions when responding:\n"
         "- Assume that the user is a highly experienced analyst.\n"
         "- Be as detailed, organized, and accurate as possible.\n"
         "- Always keep the original user query in context and do not deviate from it.\n"
@@ -28,22 +30,197 @@ def system_prompt() -> str:
         "- Provide clear recommendations and structured outputs.\n"
     )
 
+# Fixed prompt blocks are module-level constants so every call sends the same
+# leading bytes, maximizing provider-side prefix-cache hits.
+_PLAN_PROMPT_INSTRUCTIONS = (
+    "You are deciding how to conduct further research.\n\n"
+    "Based on the original query and the learnings so far, determine how many new SERP queries to run "
+    "and how many additional research iterations are needed. If you believe that sufficient information "
+    "has been gathered to produce a final report that directly answers the original query, set depth to 0. "
+    "Return your answer in valid JSON with the following structure:\n\n"
+    "{\n"
+    '  "breadth": <number of SERP queries to run this iteration>,\n'
+    '  "depth": <number of additional iterations needed; set 0 if research is complete>,\n'
+    '  "queries": [\n'
+    '    {"query": "<SERP query>", "researchGoal": "<explain what this query should achieve>"},\n'
+    "    ...\n"
+    "  ]\n"
+    "}\n\n"
+    "Do not deviate from the original query and only request further research if it will add value.\n\n"
+)
+
+_SERP_PROMPT_INSTRUCTIONS = (
+    "You will be given SERP results for one or more queries, each wrapped in an "
+    '<item index="..."> element.\n'
+    "For every item, extract the key insights as 'learnings' and suggest 'followUpQuestions' "
+    "to clarify or expand on the original query if needed.\n"
+    "Return valid JSON with one entry per item, in the same order as the items, for example:\n"
+    "{\n"
+    '  "results": [\n'
+    '    {"learnings": ["...", "..."], "followUpQuestions": ["...", "..."]},\n'
+    "    ...\n"
+    "  ]\n"
+    "}\n\n"
+)
+
 def extract_json_from_text(text: str) -> str:
-        """
-        Extracts the first JSON object found in the text.
-        """
-        json_regex = r"(\{(?:.|\n)*\})"
-        match = re.search(json_regex, text)
-        if match:
-            return match.group(1).strip()
-        return text.strip()
-    
+    """
+    Extracts the first balanced JSON object found in the text.
+    Single O(n) pass tracking brace depth (string literals and escapes are
+    respected), with none of the backtracking the old greedy regex suffered
+    on long responses.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"' and depth > 0:
+            in_string = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1].strip()
+    return text.strip()
+
 def extract_json_from_code_block(text: str) -> str:
     """
-    Removes surrounding triple backticks (```), including optional language indicators.
+    Removes a surrounding triple-backtick fence (```), including an optional
+    language indicator on the opening fence.
+    """
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        first_newline = cleaned.find("\n")
+        if first_newline != -1:
+            cleaned = cleaned[first_newline + 1:]
+        else:
+            # Single-line fence (```json{...}```): drop only the marker and
+            # the language tag glued to it, keeping the payload.
+            cleaned = cleaned[3:]
+            tag_end = 0
+            while tag_end < len(cleaned) and (cleaned[tag_end].isalnum() or cleaned[tag_end] in "_-"):
+                tag_end += 1
+            cleaned = cleaned[tag_end:]
+        if cleaned.rstrip().endswith("```"):
+            cleaned = cleaned.rstrip()[:-3]
+    return cleaned.strip()
+
+class _ReportStreamParser:
+    """
+    Incrementally extracts the "reportMarkdown" string value from a streamed
+    JSON response, decoding escapes on the fly. Feeding it raw chunks yields
+    decoded markdown as soon as the value starts arriving — no need to buffer
+    the whole response before showing anything to the user. Code fences around
+    the JSON are ignored because the parser only reacts to the key itself.
     """
-    cleaned = re.sub(r"^```\w*|\s*```$", "", text, flags=re.MULTILINE).strip()
-    return cleaned
+
+    _KEY = '"reportMarkdown"'
+
+    def __init__(self):
+        self._buffer = ""
+        self._state = "seek_key"  # seek_key -> seek_value -> in_value -> done
+        self._escaped = False
+        self._unicode_digits = ""
+        self._high_surrogate = None
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume a raw chunk and return any decoded markdown it contained.
+        """
+        out = []
+        self._buffer += chunk
+        while self._buffer:
+            if self._state == "seek_key":
+                idx = self._buffer.find(self._KEY)
+                if idx == -1:
+                    # Keep a tail in case the key straddles a chunk boundary.
+                    self._buffer = self._buffer[-len(self._KEY):]
+                    break
+                self._buffer = self._buffer[idx + len(self._KEY):]
+                self._state = "seek_value"
+            elif self._state == "seek_value":
+                idx = self._buffer.find('"')
+                if idx == -1:
+                    self._buffer = ""
+                    break
+                self._buffer = self._buffer[idx + 1:]
+                self._state = "in_value"
+            elif self._state == "in_value":
+                consumed = 0
+                for ch in self._buffer:
+                    consumed += 1
+                    if self._unicode_digits or (self._escaped and ch == "u"):
+                        self._unicode_digits += ch
+                        if len(self._unicode_digits) == 5:  # 'u' + 4 hex digits
+                            try:
+                                code = int(self._unicode_digits[1:], 16)
+                            except ValueError:
+                                code = None
+                            self._unicode_digits = ""
+                            self._escaped = False
+                            if code is None:
+                                pass
+                            elif self._high_surrogate is not None and 0xDC00 <= code <= 0xDFFF:
+                                # Second half of a surrogate pair: combine into
+                                # the real non-BMP character.
+                                out.append(chr(
+                                    0x10000
+                                    + ((self._high_surrogate - 0xD800) << 10)
+                                    + (code - 0xDC00)
+                                ))
+                                self._high_surrogate = None
+                            elif 0xD800 <= code <= 0xDBFF:
+                                # High surrogate: hold it until the low half
+                                # arrives (possibly in the next chunk).
+                                if self._high_surrogate is not None:
+                                    out.append("�")
+                                self._high_surrogate = code
+                            else:
+                                if self._high_surrogate is not None:
+                                    out.append("�")
+                                    self._high_surrogate = None
+                                # A lone low surrogate is malformed JSON; keep
+                                # the output encodable.
+                                out.append("�" if 0xDC00 <= code <= 0xDFFF else chr(code))
+                    elif self._escaped:
+                        if self._high_surrogate is not None:
+                            out.append("�")
+                            self._high_surrogate = None
+                        out.append({"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(ch, ch))
+                        self._escaped = False
+                    elif ch == "\\":
+                        self._escaped = True
+                    elif ch == '"':
+                        if self._high_surrogate is not None:
+                            out.append("�")
+                            self._high_surrogate = None
+                        self._state = "done"
+                        break
+                    else:
+                        if self._high_surrogate is not None:
+                            out.append("�")
+                            self._high_surrogate = None
+                        out.append(ch)
+                self._buffer = self._buffer[consumed:]
+            else:  # done
+                self._buffer = ""
+        # Safety net: never yield text the terminal renderer cannot encode.
+        return "".join(out).encode("utf-8", "replace").decode("utf-8")
+
+    @property
+    def found_report(self) -> bool:
+        return self._state != "seek_key"
 
 class DeepResearch:
     """
@@ -64,16 +241,28 @@ class DeepResearch:
         llm: LLMClient,
         web_search: WebSearch,
         content_fetcher: ContentFetcher,
-        concurrency_limit: int = 2,
+        search_concurrency: int = 4,
+        fetch_concurrency: int = 8,
+        llm_concurrency: int = 4,
         verbose: bool = True,
         max_iterations: int = 10,
+        query_timeout: float = 300.0,
     ):
         self.llm = llm
         self.web_search = web_search
         self.content_fetcher = content_fetcher
-        self.semaphore = asyncio.Semaphore(concurrency_limit)
+        # Separate semaphores per pipeline stage so the fetch of one query can
+        # overlap with the LLM processing of another instead of serializing
+        # unrelated phases behind a single lock.
+        self.search_sem = asyncio.Semaphore(search_concurrency)
+        self.fetch_sem = asyncio.Semaphore(fetch_concurrency)
+        self.llm_sem = asyncio.Semaphore(llm_concurrency)
         self.verbose = verbose
         self.max_iterations = max_iterations
+        self.query_timeout = query_timeout
+        # Snapshot the system prompt once per run instead of rebuilding the
+        # string (and re-reading the clock) on every LLM call.
+        self._system_prompt = system_prompt()
 
         if self.verbose:
             logger.setLevel(logging.DEBUG)
@@ -97,30 +286,20 @@ class DeepResearch:
         If sufficient information has been gathered, the LLM should set depth to 0.
         """
         learnings_str = "\n".join(f"- {lrn}" for lrn in learnings) if learnings else "No prior learnings."
+        # Fixed instructions and the JSON schema lead the prompt; the dynamic
+        # query/learnings come last so the stable prefix is byte-identical
+        # across iterations and provider-side prefix caching can kick in.
         prompt_text = (
-            "You are deciding how to conduct further research.\n\n"
-            f"Original query: {original_query}\n\n"
-            f"Learnings from previous research steps:\n{learnings_str}\n\n"
-            "Based on the original query and the learnings so far, determine how many new SERP queries to run "
-            "and how many additional research iterations are needed. If you believe that sufficient information "
-            "has been gathered to produce a final report that directly answers the original query, set depth to 0. "
-            "Return your answer in valid JSON with the following structure:\n\n"
-            "{\n"
-            '  "breadth": <number of SERP queries to run this iteration>,\n'
-            '  "depth": <number of additional iterations needed; set 0 if research is complete>,\n'
-            '  "queries": [\n'
-            '    {"query": "<SERP query>", "researchGoal": "<explain what this query should achieve>"},\n'
-            "    ...\n"
-            "  ]\n"
-            "}\n\n"
-            "Do not deviate from the original query and only request further research if it will add value."
+            _PLAN_PROMPT_INSTRUCTIONS
+            + f"Original query: {original_query}\n\n"
+            + f"Learnings from previous research steps:\n{learnings_str}"
         )
 
         if self.verbose:
             logger.debug("[ask_llm_for_research_plan] Sending to LLM:\n%s", prompt_text)
 
-        response_data = self.llm.generate(
-            system_prompt=system_prompt(),
+        response_data = await self.llm.generate(
+            system_prompt=self._system_prompt,
             messages=[{"role": "user", "content": prompt_text}],
             max_tokens=1024,
             temperature=0.6
@@ -136,7 +315,7 @@ class DeepResearch:
 
         cleaned_response = extract_json_from_code_block(raw_response)
         try:
-            plan = json.loads(cleaned_response)
+            plan = orjson.loads(cleaned_response)
             # Validate minimal structure
             breadth = plan.get("breadth", 0)
             depth = plan.get("depth", 0)
@@ -154,77 +333,108 @@ class DeepResearch:
         serp_contents: List[str],
     ) -> Dict[str, List[str]]:
         """
-        Process SERP results by having the LLM extract key learnings and follow-up questions.
+        Process SERP results for a single query. Thin wrapper over
+        `process_serp_batch` for callers that only have one query.
         Returns a dict:
         {
           "learnings": [...],
           "followUpQuestions": [...]
         }
         """
-        contents_str = ""
-        for content in serp_contents:
-            chunk = trim_prompt(content, context_size=25000)
-            contents_str += f"<content>\n{chunk}\n</content>\n"
+        results = await self.process_serp_batch([(query, serp_contents)])
+        return results[0]
 
-        prompt_text = (
-            "We have the following SERP results for this query:\n"
-            f"<query>{query}</query>\n\n"
-            f"<contents>\n{contents_str}</contents>\n\n"
-            "Based on these contents, provide a JSON object with two arrays: 'learnings' and 'followUpQuestions'.\n"
-            "The 'learnings' should contain the key insights from these results, and the 'followUpQuestions' "
-            "should suggest further questions to clarify or expand on the original query if needed.\n"
-            "Return valid JSON, for example:\n"
-            "{\n"
-            '  "learnings": ["...", "..."],\n'
-            '  "followUpQuestions": ["...", "..."]\n'
-            "}"
-        )
+    async def process_serp_batch(
+        self,
+        queries_contents: List[tuple],
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Process SERP results for several queries in one combined LLM call.
+        Batching the extraction means one round-trip per iteration instead of
+        one per query, cutting call count and per-call overhead by ~Nx.
+
+        Parameters:
+            queries_contents: List of (query, serp_contents) pairs.
+
+        Returns:
+            One {"learnings": [...], "followUpQuestions": [...]} dict per input
+            pair, in the same order.
+        """
+        if not queries_contents:
+            return []
+
+        # Split a global token budget across all contents up front so the
+        # combined prompt cannot overshoot the context window, and pre-cap by
+        # characters (~4 chars/token) so trim_prompt never tokenizes more
+        # input than the budget could possibly admit.
+        total_contents = sum(len(contents) for _, contents in queries_contents)
+        budget = 100_000 // max(1, total_contents)
+        budget = min(budget, 25000)
+
+        items = []
+        for idx, (query, serp_contents) in enumerate(queries_contents):
+            content_parts = []
+            for content in serp_contents:
+                # Failed crawls can surface as content=None; treat them as
+                # empty rather than letting the slice blow up.
+                chunk = trim_prompt((content or "")[:budget * 4], context_size=budget)
+                content_parts.append(f"<content>\n{chunk}\n</content>\n")
+            contents_str = "".join(content_parts)
+            items.append(
+                f'<item index="{idx}">\n'
+                f"<query>{query}</query>\n"
+                f"<contents>\n{contents_str}</contents>\n"
+                f"</item>"
+            )
+
+        prompt_text = _SERP_PROMPT_INSTRUCTIONS + "\n".join(items)
 
         if self.verbose:
-            logger.debug("[process_serp_result] Prompt to LLM:\n%s", prompt_text)
+            logger.debug("[process_serp_batch] Prompt to LLM:\n%s", prompt_text)
 
-        response_data = self.llm.generate(
-            system_prompt=system_prompt(),
+        response_data = await self.llm.generate(
+            system_prompt=self._system_prompt,
             messages=[{"role": "user", "content": prompt_text}],
-            max_tokens=2048,
+            max_tokens=min(8192, 2048 * len(queries_contents)),
             temperature=0.6
         )
 
         if not response_data.get("success"):
-            logger.error("Failed to process SERP result: %s", response_data.get("error"))
-            return {"learnings": [], "followUpQuestions": []}
+            logger.error("Failed to process SERP batch: %s", response_data.get("error"))
+            return [{"learnings": [], "followUpQuestions": []} for _ in queries_contents]
 
         raw_response = response_data["response"].strip()
         if self.verbose:
-            logger.debug("[process_serp_result] LLM raw response:\n%s", raw_response)
+            logger.debug("[process_serp_batch] LLM raw response:\n%s", raw_response)
 
         cleaned_response = extract_json_from_code_block(raw_response)
         try:
-            parsed = json.loads(cleaned_response)
-            return {
-                "learnings": parsed.get("learnings", []),
-                "followUpQuestions": parsed.get("followUpQuestions", []),
-            }
+            parsed = orjson.loads(cleaned_response)
+            results = parsed.get("results", [])
+            if not isinstance(results, list):
+                raise ValueError("'results' is not a list.")
         except Exception as e:
-            logger.error("[process_serp_result] JSON parse error: %s\nCleaned response was: %s", e, cleaned_response)
-            return {"learnings": [], "followUpQuestions": []}
-        
-    
-
-    async def write_final_report(
-        self,
-        original_query: str,
-        learnings: List[str],
-        visited_urls: List[str]
-    ) -> str:
+            logger.error("[process_serp_batch] JSON parse error: %s\nCleaned response was: %s", e, cleaned_response)
+            return [{"learnings": [], "followUpQuestions": []} for _ in queries_contents]
+
+        # Splice results back to per-query slots, padding short responses.
+        normalized = []
+        for idx in range(len(queries_contents)):
+            entry = results[idx] if idx < len(results) and isinstance(results[idx], dict) else {}
+            normalized.append({
+                "learnings": entry.get("learnings", []),
+                "followUpQuestions": entry.get("followUpQuestions", []),
+            })
+        return normalized
+
+    def _build_final_report_prompt(self, original_query: str, learnings: List[str]) -> str:
         """
-        Ask the LLM to write a final detailed report based on the original query and the aggregated learnings.
-        Returns the report in Markdown, with a Sources section appended.
+        Build the final-report prompt shared by the blocking and streaming paths.
         """
         learnings_str = "\n".join(f"<learning>\n{lrn}\n</learning>" for lrn in learnings)
         learnings_str = trim_prompt(learnings_str, context_size=150000)
 
-        prompt_text = (
+        return (
     "We have completed our deep research. Please respond to the user based on the original query and the compiled learnings.\n\n"
     "1. **If the user is asking a direct question or wants a brief answer**, provide a concise, clear response first.\n"
     "2. **If the user is asking for a detailed or final report**, produce a structured, in-depth report in proper Markdown format.\n"
@@ -248,14 +458,29 @@ class DeepResearch:
     "Be sure to use all relevant learnings and, if needed, clearly state any assumptions or remaining questions."
 )
 
+    async def write_final_report(
+        self,
+        original_query: str,
+        learnings: List[str],
+        visited_urls: List[str]
+    ) -> str:
+        """
+        Ask the LLM to write a final detailed report based on the original query and the aggregated learnings.
+        Returns the report in Markdown, with a Sources section appended.
+        """
+        prompt_text = self._build_final_report_prompt(original_query, learnings)
 
         if self.verbose:
             logger.debug("[write_final_report] Prompt to LLM:\n%s", prompt_text)
 
-        response_data = self.llm.generate(
-            system_prompt=system_prompt(),
+        # Size the output budget from the amount of material actually
+        # gathered; a flat 10k inflates latency and cost on small runs.
+        max_tokens = min(10000, 512 + 200 * len(learnings))
+
+        response_data = await self.llm.generate(
+            system_prompt=self._system_prompt,
             messages=[{"role": "user", "content": prompt_text}],
-            max_tokens=10000,
+            max_tokens=max_tokens,
             temperature=0.6
         )
 
@@ -270,7 +495,7 @@ class DeepResearch:
         # Use the improved extraction function.
         cleaned_response = extract_json_from_text(raw_response)
         try:
-            parsed = json.loads(cleaned_response)
+            parsed = orjson.loads(cleaned_response)
             report_markdown = parsed.get("reportMarkdown", "")
             if visited_urls:
                 sources_section = "\n\n## Sources\n" + "\n".join(f"- {u}" for u in visited_urls)
@@ -280,6 +505,53 @@ class DeepResearch:
             logger.error("[write_final_report] JSON parse error: %s\nCleaned response was: %s", e, cleaned_response)
             return cleaned_response
 
+    async def stream_final_report(
+        self,
+        original_query: str,
+        learnings: List[str],
+        visited_urls: List[str]
+    ):
+        """
+        Streaming variant of `write_final_report`. Yields markdown chunks as
+        the LLM generates them, so the user sees the report at time-to-first-
+        token instead of waiting for the whole generation. The "reportMarkdown"
+        JSON value is extracted incrementally; if the model did not wrap its
+        answer in JSON, the raw response is yielded instead. A Sources section
+        is appended at the end.
+        """
+        prompt_text = self._build_final_report_prompt(original_query, learnings)
+
+        if self.verbose:
+            logger.debug("[stream_final_report] Prompt to LLM:\n%s", prompt_text)
+
+        max_tokens = min(10000, 512 + 200 * len(learnings))
+        parser = _ReportStreamParser()
+        raw_parts = []
+
+        try:
+            async for chunk in self.llm.generate_stream(
+                system_prompt=self._system_prompt,
+                messages=[{"role": "user", "content": prompt_text}],
+                max_tokens=max_tokens,
+                temperature=0.6
+            ):
+                raw_parts.append(chunk)
+                decoded = parser.feed(chunk)
+                if decoded:
+                    yield decoded
+        except Exception as e:
+            logger.error("Failed to stream final report: %s", e)
+            if not raw_parts:
+                yield "Error: LLM did not produce a final report."
+                return
+
+        if not parser.found_report and raw_parts:
+            # The model ignored the JSON wrapper; fall back to the raw text.
+            yield extract_json_from_code_block("".join(raw_parts))
+
+        if visited_urls:
+            yield "\n\n## Sources\n" + "\n".join(f"- {u}" for u in visited_urls)
+
     async def deep_research(
         self,
         original_query: str,
@@ -294,82 +566,157 @@ class DeepResearch:
         """
         learnings = initial_learnings[:] if initial_learnings else []
         visited_urls = initial_visited_urls[:] if initial_visited_urls else []
+        # Membership sets kept alongside the ordered lists make dedup O(1)
+        # per item instead of rebuilding a dict over everything each round.
+        seen_learnings = set(learnings)
+        seen_urls = set(visited_urls)
         iteration_count = 0
+        stale_iterations = 0
+        pending_plan_task = None
 
-        while iteration_count < self.max_iterations:
-            iteration_count += 1
-            if self.verbose:
-                logger.debug(f"--- Iteration {iteration_count} ---")
-                logger.debug(f"Original query: {original_query}")
-                logger.debug(f"Current learnings ({len(learnings)}): {learnings}")
-                logger.debug(f"Visited URLs so far ({len(visited_urls)}): {visited_urls}")
-
-            # Ask the LLM for a research plan, always including the original query
-            plan = await self.ask_llm_for_research_plan(original_query, learnings)
-            breadth = plan.get("breadth", 0)
-            depth = plan.get("depth", 0)
-            serp_queries = plan.get("queries", [])
-
-            if self.verbose:
-                logger.info(f"[deep_research] LLM says: breadth={breadth}, depth={depth}, #queries={len(serp_queries)}")
-
-            # Stop if the LLM indicates no further research is needed.
-            if breadth <= 0 or depth <= 0 or len(serp_queries) == 0:
+        # Start the shared crawler once so browser warmup is paid a single time
+        # for the whole session instead of once per query.
+        await self.content_fetcher.start()
+        try:
+            while iteration_count < self.max_iterations:
+                iteration_count += 1
                 if self.verbose:
-                    logger.info("[deep_research] LLM indicated no further research is needed. Stopping.")
-                break
-
-            # Limit the queries to the given breadth
-            serp_queries = serp_queries[:breadth]
-
-            async def run_single_query(qdict: Dict[str, str]) -> Dict[str, Any]:
-                qtext = qdict.get("query", "")
-                logger.debug(f"[run_single_query] Searching for: {qtext}")
+                    logger.debug(f"--- Iteration {iteration_count} ---")
+                    logger.debug(f"Original query: {original_query}")
+                    logger.debug(f"Current learnings ({len(learnings)}): {learnings}")
+                    logger.debug(f"Visited URLs so far ({len(visited_urls)}): {visited_urls}")
+
+                # Ask the LLM for a research plan, always including the original
+                # query. If the previous iteration speculatively fired the plan
+                # call it is usually already done by now.
+                if pending_plan_task is not None:
+                    plan = await pending_plan_task
+                    pending_plan_task = None
+                else:
+                    plan = await self.ask_llm_for_research_plan(original_query, learnings)
+                breadth = plan.get("breadth", 0)
+                depth = plan.get("depth", 0)
+                serp_queries = plan.get("queries", [])
 
-                async with self.semaphore:
-                    results = self.web_search.search(qtext, max_results=breadth)
-                new_urls = [r["url"] for r in results if r.get("url")]
-
-                logger.debug(f"[run_single_query] Found {len(new_urls)} URLs")
-
-                contents = []
-                if new_urls:
+                if self.verbose:
+                    logger.info(f"[deep_research] LLM says: breadth={breadth}, depth={depth}, #queries={len(serp_queries)}")
+
+                # Stop if the LLM indicates no further research is needed.
+                if breadth <= 0 or depth <= 0 or len(serp_queries) == 0:
+                    if self.verbose:
+                        logger.info("[deep_research] LLM indicated no further research is needed. Stopping.")
+                    break
+
+                # Limit the queries to the given breadth
+                serp_queries = serp_queries[:breadth]
+
+                async def run_single_query(qdict: Dict[str, str]) -> Dict[str, Any]:
+                    qtext = qdict.get("query", "")
+                    logger.debug(f"[run_single_query] Searching for: {qtext}")
+
+                    async with self.search_sem:
+                        results = await self.web_search.search_async(qtext, max_results=breadth)
+                    new_urls = [r["url"] for r in results if r.get("url")]
+
+                    logger.debug(f"[run_single_query] Found {len(new_urls)} URLs")
+
+                    contents = []
+                    if new_urls:
+                        try:
+                            async with self.fetch_sem:
+                                fetched = await self.content_fetcher.fetch_content(new_urls)
+                            for cd in fetched:
+                                contents.append(cd["content"])
+                        except Exception as e:
+                            logger.error(f"[run_single_query] Error fetching content for {qtext}: {e}")
+
+                    return {
+                        "query": qtext,
+                        "urls": new_urls,
+                        "contents": contents,
+                    }
+
+                # Each query pipeline gets a hard time budget so one stuck
+                # search/fetch/LLM call cannot hang the whole iteration.
+                tasks = [
+                    asyncio.ensure_future(
+                        asyncio.wait_for(run_single_query(qdict), timeout=self.query_timeout)
+                    )
+                    for qdict in serp_queries
+                ]
+
+                step_urls = []
+                fetched_queries = []
+
+                # Aggregate as soon as each query's pipeline finishes rather
+                # than waiting for the slowest one before touching any result.
+                for finished in asyncio.as_completed(tasks):
                     try:
-                        async with self.semaphore:
-                            fetched = await self.content_fetcher.fetch_content(new_urls)
-                        for cd in fetched:
-                            contents.append(cd["content"])
-                    except Exception as e:
-                        logger.error(f"[run_single_query] Error fetching content for {qtext}: {e}")
-
-                results_dict = await self.process_serp_result(qtext, contents)
-                return {
-                    "urls": new_urls,
-                    "learnings": results_dict["learnings"],
-                    "followUps": results_dict["followUpQuestions"],
-                }
-
-            tasks = [run_single_query(qdict) for qdict in serp_queries]
-            step_results = await asyncio.gather(*tasks)
-
-            step_learnings = []
-            step_urls = []
-
-            for sr in step_results:
-                step_learnings.extend(sr["learnings"])
-                step_urls.extend(sr["urls"])
-
-            # Deduplicate
-            learnings = list(dict.fromkeys(learnings + step_learnings))
-            visited_urls = list(dict.fromkeys(visited_urls + step_urls))
-
-            if self.verbose:
-                logger.debug(f"[deep_research] Iteration {iteration_count} done. Total learnings: {len(learnings)}; Total URLs: {len(visited_urls)}.")
-
-            if depth <= 1:
+                        sr = await finished
+                    except asyncio.TimeoutError:
+                        logger.error("[deep_research] A query pipeline timed out after %ss; counting it as zero results.", self.query_timeout)
+                        continue
+                    step_urls.extend(sr["urls"])
+                    fetched_queries.append((sr["query"], sr["contents"]))
+
+                # Speculatively fire the next iteration's plan call so it runs
+                # concurrently with the batched extraction below, taking one
+                # LLM round-trip off the critical path. It only sees the
+                # learnings gathered so far; if the loop terminates instead,
+                # the task is cancelled in the finally block.
+                if depth > 1:
+                    pending_plan_task = asyncio.create_task(
+                        self.ask_llm_for_research_plan(original_query, learnings[:])
+                    )
+
+                # One combined extraction call for the whole iteration instead
+                # of one LLM round-trip per query.
+                step_learnings = []
+                if fetched_queries:
+                    async with self.llm_sem:
+                        batch_results = await self.process_serp_batch(fetched_queries)
+                    for br in batch_results:
+                        step_learnings.extend(br["learnings"])
+
+                # Deduplicate
+                prev_learning_count = len(learnings)
+                for lrn in step_learnings:
+                    if lrn not in seen_learnings:
+                        seen_learnings.add(lrn)
+                        learnings.append(lrn)
+                for url in step_urls:
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        visited_urls.append(url)
+
                 if self.verbose:
-                    logger.info("[deep_research] LLM indicated final iteration. Stopping.")
-                break
+                    logger.debug(f"[deep_research] Iteration {iteration_count} done. Total learnings: {len(learnings)}; Total URLs: {len(visited_urls)}.")
+
+                # If iterations stop surfacing new material, the search space
+                # is exhausted; terminate before paying for another plan call.
+                new_count = len(learnings) - prev_learning_count
+                if new_count == 0:
+                    stale_iterations += 1
+                    if stale_iterations >= 2:
+                        if self.verbose:
+                            logger.info("[deep_research] No new learnings for two consecutive iterations. Stopping.")
+                        break
+                else:
+                    stale_iterations = 0
+                    if iteration_count > 1 and step_learnings and new_count / len(step_learnings) < 0.05:
+                        if self.verbose:
+                            logger.info("[deep_research] Over 95% of this iteration's learnings were duplicates. Stopping.")
+                        break
+
+                if depth <= 1:
+                    if self.verbose:
+                        logger.info("[deep_research] LLM indicated final iteration. Stopping.")
+                    break
+
+        finally:
+            if pending_plan_task is not None and not pending_plan_task.done():
+                pending_plan_task.cancel()
+            await self.content_fetcher.close()
 
         return {
             "learnings": learnings,
@@ -3,7 +3,16 @@ import os
 import sys
 import logging
 
+try:
+    # The whole app is I/O-bound fan-out; uvloop's libuv-based event loop
+    # schedules it noticeably faster than the default asyncio loop.
+    import uvloop
+    uvloop.install()
+except ImportError:  # uvloop is not available on Windows
+    pass
+
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 
 from research import DeepResearch
@@ -43,8 +52,10 @@ async def main():
         llm=llm_client,
         web_search=search_client,
         content_fetcher=fetcher,
-        concurrency_limit=2,
-        verbose=True, 
+        search_concurrency=4,
+        fetch_concurrency=8,
+        llm_concurrency=4,
+        verbose=True,
         max_iterations=10
     )
 
@@ -52,15 +63,19 @@ async def main():
     research_result = await deep_researcher.deep_research(query)
     logger.info("Deep research completed. Generating final report...")
 
-    final_report = await deep_researcher.write_final_report(
-        original_query=query,
-        learnings=research_result["learnings"],
-        visited_urls=research_result["visited_urls"]
-    )
-
     console.print("\n[bold blue]=== FINAL REPORT ===[/bold blue]\n")
-    md = Markdown(final_report)
-    console.print(md)
+
+    # Stream the report so it starts rendering at time-to-first-token
+    # instead of after the whole generation finishes.
+    report_parts = []
+    with Live(console=console, refresh_per_second=4) as live:
+        async for chunk in deep_researcher.stream_final_report(
+            original_query=query,
+            learnings=research_result["learnings"],
+            visited_urls=research_result["visited_urls"]
+        ):
+            report_parts.append(chunk)
+            live.update(Markdown("".join(report_parts)))
 
     if research_result["visited_urls"]:
         console.print("\n[bold]Visited URLs:[/bold]")
@@ -1,3 +1,5 @@
+import asyncio
+
 from duckduckgo_search import DDGS
 from typing import List, Dict, Optional
 
@@ -53,3 +55,18 @@ class WebSearch:
         except Exception as e:
             print(f"Search request failed: {e}")
             return []
+
+    async def search_async(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Async wrapper around `search`. The DuckDuckGo client is synchronous, so
+        the call is offloaded to a thread to avoid blocking the event loop and
+        to let multiple SERP queries actually run in parallel.
+
+        Parameters:
+            query (str): The search query.
+            max_results (int, optional): How many results to retrieve. If None, defaults to self.max_results.
+
+        Returns:
+            List[Dict[str, str]]: List of structured search results.
+        """
+        return await asyncio.to_thread(self.search, query, max_results)
@@ -1,6 +1,22 @@
+import functools
+import logging
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import tiktoken
 from typing import List
 
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=4)
+def _get_encoder(name: str = "o200k_base") -> "tiktoken.Encoding":
+    """
+    Load a tiktoken encoding once per process. Rebuilding the BPE merge table
+    on every call is expensive compared to the encode itself.
+    """
+    return tiktoken.get_encoding(name)
+
 class TextSplitter:
     """
     A base class for splitting text into smaller chunks for processing.
@@ -50,36 +66,113 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         """
         super().__init__(chunk_size, chunk_overlap)
         self.separators = separators or ["\n\n", "\n", ".", ",", " ", ""]
+        # One compiled alternation over the separator set lets a single linear
+        # scan discover every separator present, instead of one pass per
+        # candidate. Longer separators come first in the list, so "\n\n" wins
+        # over "\n" at the same position.
+        self._sep_re = re.compile("|".join(re.escape(s) for s in self.separators if s))
 
     def split_text(self, text: str) -> List[str]:
         """
         Split text recursively using the best separator.
-        
+        Internally the text is never copied into intermediate pieces: the
+        split positions are carried as (start, end) index pairs and a string
+        is only sliced out when a chunk is actually emitted.
+
         Parameters:
             text (str): The input text.
-            
+
         Returns:
             List[str]: A list of optimally split text chunks.
         """
+        return self._split_range(text, 0, len(text))
+
+    @staticmethod
+    def _iter_split_indices(text: str, sep: str, start: int, end: int):
+        """
+        Yield (start, end) spans of text[start:end] split on sep, without
+        materializing the substrings.
+        """
+        sep_len = len(sep)
+        pos = start
+        while True:
+            idx = text.find(sep, pos, end)
+            if idx == -1:
+                yield (pos, end)
+                return
+            yield (pos, idx)
+            pos = idx + sep_len
+
+    def _split_range(self, text: str, start: int, end: int) -> List[str]:
         final_chunks = []
-        separator = next((s for s in self.separators if s in text), self.separators[-1])
-        splits = text.split(separator) if separator else list(text)
 
-        good_splits = []
-        for split in splits:
-            if len(split) < self.chunk_size:
-                good_splits.append(split)
+        # Probe only a bounded prefix, and with a single pass of the compiled
+        # alternation rather than one scan per candidate separator. If a
+        # separator does not occur within a few chunk sizes a later one will
+        # split just as well.
+        probe_limit = min(end, start + 4 * self.chunk_size)
+        found = set()
+        for m in self._sep_re.finditer(text, start, probe_limit):
+            found.add(m.group(0))
+            if m.group(0) == self.separators[0]:
+                break
+        separator = self.separators[-1]
+        for s in self.separators:
+            if not s or s in found:
+                separator = s
+                break
+
+        if separator:
+            spans = self._iter_split_indices(text, separator, start, end)
+        else:
+            spans = ((i, i + 1) for i in range(start, end))
+
+        good_spans = []
+        for span in spans:
+            if span[1] - span[0] < self.chunk_size:
+                good_spans.append(span)
             else:
-                if good_splits:
-                    final_chunks.extend(self.merge_splits(good_splits, separator))
-                    good_splits = []
-                final_chunks.extend(self.split_text(split))
-        
-        if good_splits:
-            final_chunks.extend(self.merge_splits(good_splits, separator))
-        
+                if good_spans:
+                    final_chunks.extend(self._merge_spans(text, good_spans))
+                    good_spans = []
+                final_chunks.extend(self._split_range(text, span[0], span[1]))
+
+        if good_spans:
+            final_chunks.extend(self._merge_spans(text, good_spans))
+
         return final_chunks
 
+    def _merge_spans(self, text: str, spans: List[tuple]) -> List[str]:
+        """
+        Span-based equivalent of `merge_splits`: consecutive spans are
+        contiguous in the original text (modulo the separator between them),
+        so a merged chunk is a single slice from the first span's start to the
+        last span's end.
+        """
+        docs = []
+        window = deque()
+        total_length = 0
+
+        for span in spans:
+            part_length = span[1] - span[0]
+            if total_length + part_length >= self.chunk_size:
+                if total_length > self.chunk_size:
+                    logger.warning("Chunk exceeds max size (%d)", self.chunk_size)
+
+                if window:
+                    docs.append(text[window[0][0]:window[-1][1]].strip())
+                    while total_length > self.chunk_overlap and window:
+                        evicted = window.popleft()
+                        total_length -= evicted[1] - evicted[0]
+
+            window.append(span)
+            total_length += part_length
+
+        if window:
+            docs.append(text[window[0][0]:window[-1][1]].strip())
+
+        return docs
+
     def merge_splits(self, splits: List[str], separator: str) -> List[str]:
         """
         Merge split chunks while ensuring they fit within the chunk size.
@@ -91,28 +184,48 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         Returns:
             List[str]: A list of merged chunks.
         """
-        docs, current_chunk = [], []
+        docs = []
+        # Deques make the overlap shrink O(1) per evicted part; list.pop(0)
+        # shifted the whole window every time. Lengths are tracked alongside
+        # the parts so eviction never re-measures them.
+        current_chunk = deque()
+        lengths = deque()
         total_length = 0
 
         for part in splits:
             part_length = len(part)
             if total_length + part_length >= self.chunk_size:
                 if total_length > self.chunk_size:
-                    print(f"Warning: Chunk exceeds max size ({self.chunk_size})")
+                    logger.warning("Chunk exceeds max size (%d)", self.chunk_size)
 
                 if current_chunk:
                     docs.append(separator.join(current_chunk).strip())
                     while total_length > self.chunk_overlap and current_chunk:
-                        total_length -= len(current_chunk.pop(0))
+                        total_length -= lengths.popleft()
+                        current_chunk.popleft()
 
             current_chunk.append(part)
+            lengths.append(part_length)
             total_length += part_length
-        
+
         if current_chunk:
             docs.append(separator.join(current_chunk).strip())
 
         return docs
 
+@functools.lru_cache(maxsize=64)
+def _get_splitter(
+    chunk_size: int, chunk_overlap: int, separators: tuple = None
+) -> RecursiveCharacterTextSplitter:
+    """
+    Reuse splitter instances across trim_prompt calls. A splitter is pure
+    configuration plus a compiled separator regex, so identical settings can
+    share one instance instead of rebuilding both on every call.
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size, chunk_overlap, list(separators) if separators else None
+    )
+
 def trim_prompt(prompt: str, context_size: int = 120000, min_chunk_size: int = 140) -> str:
     """
     Trim a prompt to fit within the maximum context size.
@@ -128,17 +241,52 @@ def trim_prompt(prompt: str, context_size: int = 120000, min_chunk_size: int = 1
     if not prompt:
         return ""
 
-    encoder = tiktoken.get_encoding("o200k_base")
-    length = len(encoder.encode(prompt))
+    # Pre-truncate by characters before the first encode: tiktoken's cost is
+    # superlinear in input length, and no prompt that fits in context_size
+    # tokens can be longer than ~8 chars per token anyway.
+    prompt = prompt[:context_size * 8]
 
-    if length <= context_size:
+    encoder = _get_encoder()
+    ids = encoder.encode_ordinary(prompt)
+    if len(ids) <= context_size:
         return prompt
 
-    overflow_tokens = length - context_size
-    estimated_chars = overflow_tokens * 3
-    chunk_size = max(len(prompt) - estimated_chars, min_chunk_size)
+    # Cut at the token level directly: keep the first context_size tokens and
+    # decode them back. One encode plus one decode replaces the old
+    # estimate-split-re-encode convergence loop entirely.
+    decoded = encoder.decode(ids[:context_size])
+
+    # Snap the tail to a natural separator so the prompt doesn't stop
+    # mid-sentence.
+    chunk_size = max(len(decoded) - 1, min_chunk_size)
+    splitter = _get_splitter(chunk_size, 0)
+    chunks = splitter.split_text(decoded)
+    return chunks[0] if chunks else decoded
+
+def trim_prompts(
+    prompts: List[str],
+    context_size: int = 120000,
+    min_chunk_size: int = 140,
+    max_workers: int = None
+) -> List[str]:
+    """
+    Trim a batch of prompts in parallel. tiktoken's Rust core releases the
+    GIL during encode, so a thread pool scales with cores whenever the
+    prompts are long enough for encoding to dominate.
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=0)
-    trimmed_prompt = splitter.split_text(prompt)[0] if splitter.split_text(prompt) else ""
+    Parameters:
+        prompts (List[str]): The input prompts.
+        context_size (int): The maximum allowed token length per prompt.
+        min_chunk_size (int): The minimum allowable chunk size.
+        max_workers (int, optional): Thread count; defaults to the executor's choice.
+
+    Returns:
+        List[str]: The trimmed prompts, in input order.
+    """
+    if not prompts:
+        return []
 
-    return trim_prompt(trimmed_prompt, context_size) if len(trimmed_prompt) == len(prompt) else trimmed_prompt
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda p: trim_prompt(p, context_size, min_chunk_size), prompts
+        ))